@@ -1,23 +1,76 @@
 """Bootstrap module for Metorial Python Lambda handlers."""
 import asyncio
+import io
 import json
 import sys
 import os
+import re
 import importlib.util
+import traceback
+from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
-from io import StringIO
+
+try:
+  import orjson
+except ImportError:
+  orjson = None
 
 from . import config
 from . import oauth
 from . import callbacks
 
-_user_module_loaded = False
-_server = None
-_handlers = {}
+@dataclass(slots=True)
+class _BootState:
+  """Process-wide state of the loaded user server, reused across warm invocations."""
+  module_loaded: bool = False
+  server: Any = None
+  handlers: Dict[str, Any] = field(default_factory=dict)
+  server_wrapper: Any = None
+
+_state = _BootState()
+
+if orjson is not None:
+  # orjson silently decodes integers outside the 64-bit range as floats. Any such
+  # literal has at least 19 digits, so text with a 19-digit run goes to json.loads.
+  _LONG_DIGIT_RUN = re.compile(r'\d{19}')
+  _LONG_DIGIT_RUN_BYTES = re.compile(rb'\d{19}')
+
+  def _loads(value: Any) -> Any:
+    pattern = _LONG_DIGIT_RUN if isinstance(value, str) else _LONG_DIGIT_RUN_BYTES
+    try:
+      if pattern.search(value) is None:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
+      # orjson rejects some input the stdlib accepts, such as NaN and Infinity.
+      pass
+    return json.loads(value)
+
+  def _dumps(value: Any) -> str:
+    try:
+      return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    except orjson.JSONEncodeError:
+      # e.g. integers wider than 64 bits, which json.dumps still encodes.
+      return json.dumps(value)
+else:
+  _loads = json.loads
+  _dumps = json.dumps
+
+class _ListIO(io.TextIOBase):
+  """Text sink that keeps each write instead of growing one buffer."""
+  
+  def __init__(self):
+    super().__init__()
+    self.parts = []
+  
+  def write(self, s: str) -> int:
+    self.parts.append(s)
+    return len(s)
 
 class LogCapture:
   """Captures stdout/stderr for log instrumentation."""
   
+  __slots__ = ('logs', 'original_stdout', 'original_stderr', 'stdout_capture', 'stderr_capture')
+  
   def __init__(self):
     self.logs = []
     self.original_stdout = None
@@ -29,8 +82,8 @@ class LogCapture:
     """Start capturing output."""
     self.original_stdout = sys.stdout
     self.original_stderr = sys.stderr
-    self.stdout_capture = StringIO()
-    self.stderr_capture = StringIO()
+    self.stdout_capture = _ListIO()
+    self.stderr_capture = _ListIO()
     sys.stdout = self.stdout_capture
     sys.stderr = self.stderr_capture
   
@@ -41,30 +94,55 @@ class LogCapture:
     if self.original_stderr:
       sys.stderr = self.original_stderr
     
-    if self.stdout_capture:
-      stdout_text = self.stdout_capture.getvalue()
-      if stdout_text.strip():
-        self.logs.append({
-          "type": "info",
-          "lines": stdout_text.strip().split('\n')
-        })
-    
-    if self.stderr_capture:
-      stderr_text = self.stderr_capture.getvalue()
-      if stderr_text.strip():
-        self.logs.append({
-          "type": "error",
-          "lines": stderr_text.strip().split('\n')
-        })
+    self._collect(self.stdout_capture, "info")
+    self._collect(self.stderr_capture, "error")
     
     return self.logs
+  
+  def _collect(self, capture, log_type):
+    """Append the captured text as one log entry, skipping untouched buffers."""
+    if not capture or not capture.parts:
+      return
+    
+    text = ''.join(capture.parts).strip()
+    if text:
+      self.logs.append({
+        "type": log_type,
+        "lines": text.split('\n')
+      })
 
-def load_user_server(args: Dict[str, Any]):
-  global _user_module_loaded, _server, _handlers
+def _decode_messages(messages_raw: list) -> list:
+  """Decode a batch of MCP messages, passing already-decoded values through.
   
+  Anything that is not an object is left for _process_message to reject.
+  """
+  return [_loads(m) if isinstance(m, (str, bytes)) else m for m in messages_raw]
+
+def _error_response(code: str, e: Exception) -> Dict[str, Any]:
+  """Build the failure envelope returned by the boot handlers."""
+  return {
+    "success": False,
+    "error": {
+      "code": code,
+      "message": f"{e}\n{traceback.format_exc()}"
+    }
+  }
+
+def _as_coroutine(func):
+  """Expose a sync listing method as a coroutine function for handler consumers."""
+  async def call(*args, **kwargs):
+    return func(*args, **kwargs)
+  
+  return call
+
+def _load_user_server(args: Dict[str, Any]):
+  """Load the user module and return its handlers without touching the MCP Server."""
   config.set_args(args)
   
-  if not _user_module_loaded:
+  if _state.server_wrapper is not None:
+    return _state.handlers, _state.server_wrapper
+  
+  if not _state.module_loaded:
     entrypoint = os.environ.get('METORIAL_ENTRYPOINT', 'server.py')
     
     module_name = entrypoint.replace('.py', '').replace('/', '.')
@@ -73,50 +151,46 @@ def load_user_server(args: Dict[str, Any]):
       module = importlib.util.module_from_spec(spec)
       sys.modules[module_name] = module
       spec.loader.exec_module(module)
-      _user_module_loaded = True
+      _state.module_loaded = True
   
   server_wrapper = config.get_server()
   if server_wrapper is None:
     raise RuntimeError("No MCP server found. Did you call metorial.create_server()?")
   
-  _server = server_wrapper.mcp_server
-  
-  _handlers = {
-    'list_tools': server_wrapper._list_tools,
+  _state.handlers = {
+    'list_tools': _as_coroutine(server_wrapper._list_tools),
     'call_tool': server_wrapper._call_tool,
-    'list_resources': server_wrapper._list_resources,
+    'list_resources': _as_coroutine(server_wrapper._list_resources),
     'read_resource': server_wrapper._read_resource,
-    'list_prompts': server_wrapper._list_prompts,
+    'list_prompts': _as_coroutine(server_wrapper._list_prompts),
     'get_prompt': server_wrapper._get_prompt,
   }
+  _state.server_wrapper = server_wrapper
   
-  return _server, _handlers, server_wrapper
+  return _state.handlers, server_wrapper
+
+def load_user_server(args: Dict[str, Any]):
+  handlers, server_wrapper = _load_user_server(args)
+  _state.server = server_wrapper.mcp_server
+  
+  return _state.server, handlers, server_wrapper
+
+def prewarm_user_server() -> None:
+  """Load the user module ahead of the first invocation (Lambda init phase)."""
+  try:
+    _load_user_server({})
+  except Exception:
+    # Leave the module unloaded; the first invocation retries and reports the error.
+    pass
+  finally:
+    config.reset_request_state()
 
 async def handle_discover(event: Dict[str, Any]) -> Dict[str, Any]:
   try:
     config.reset_request_state()
     
     args = event.get('args', {})
-    server, handlers, server_wrapper = load_user_server(args)
-    
-    tools = []
-    resource_templates = []
-    prompts = []
-    
-    if 'list_tools' in handlers:
-      tools_result = await handlers['list_tools']()
-      if tools_result:
-        tools = tools_result if isinstance(tools_result, list) else []
-    
-    if 'list_resources' in handlers:
-      resources_result = await handlers['list_resources']()
-      if resources_result:
-        resource_templates = resources_result if isinstance(resources_result, list) else []
-    
-    if 'list_prompts' in handlers:
-      prompts_result = await handlers['list_prompts']()
-      if prompts_result:
-        prompts = prompts_result if isinstance(prompts_result, list) else []
+    _, server_wrapper = _load_user_server(args)
     
     capabilities = server_wrapper.get_capabilities()
     
@@ -127,28 +201,88 @@ async def handle_discover(event: Dict[str, Any]) -> Dict[str, Any]:
     return {
       "success": True,
       "discovery": {
-        "tools": tools,
-        "resourceTemplates": resource_templates,
-        "prompts": prompts,
+        "tools": server_wrapper._list_tools(),
+        "resourceTemplates": server_wrapper._list_resources(),
+        "prompts": server_wrapper._list_prompts(),
         "capabilities": capabilities,
-        "implementation": {
-          "name": server_wrapper.name,
-          "version": server_wrapper.version
-        },
+        "implementation": server_wrapper.implementation,
         "instructions": None,
         "oauth": oauth_config,
         "callbacks": callbacks_config
       }
     }
   except Exception as e:
-    import traceback
-    return {
-      "success": False,
-      "error": {
-        "code": "discovery_error",
-        "message": str(e) + "\n" + traceback.format_exc()
-      }
-    }
+    return _error_response("discovery_error", e)
+
+async def _mcp_initialize(server_wrapper, params: Dict[str, Any]) -> Dict[str, Any]:
+  return {
+    "protocolVersion": params.get('protocolVersion', '2024-11-05'),
+    "capabilities": server_wrapper.get_capabilities(),
+    "serverInfo": server_wrapper.implementation
+  }
+
+async def _mcp_tools_list(server_wrapper, params: Dict[str, Any]) -> Dict[str, Any]:
+  return {"tools": server_wrapper._list_tools()}
+
+async def _mcp_tools_call(server_wrapper, params: Dict[str, Any]) -> Any:
+  return await server_wrapper._call_tool(params.get('name'), params.get('arguments', {}))
+
+async def _mcp_resources_list(server_wrapper, params: Dict[str, Any]) -> Dict[str, Any]:
+  return {"resources": server_wrapper._list_resources()}
+
+async def _mcp_resources_read(server_wrapper, params: Dict[str, Any]) -> Any:
+  return await server_wrapper._read_resource(params.get('uri'))
+
+async def _mcp_prompts_list(server_wrapper, params: Dict[str, Any]) -> Dict[str, Any]:
+  return {"prompts": server_wrapper._list_prompts()}
+
+async def _mcp_prompts_get(server_wrapper, params: Dict[str, Any]) -> Any:
+  return await server_wrapper._get_prompt(params.get('name'), params.get('arguments', {}))
+
+async def _mcp_ping(server_wrapper, params: Dict[str, Any]) -> Dict[str, Any]:
+  return {}
+
+_MCP_METHODS = {
+  'initialize': _mcp_initialize,
+  'tools/list': _mcp_tools_list,
+  'tools/call': _mcp_tools_call,
+  'resources/list': _mcp_resources_list,
+  'resources/read': _mcp_resources_read,
+  'prompts/list': _mcp_prompts_list,
+  'prompts/get': _mcp_prompts_get,
+  'ping': _mcp_ping,
+}
+
+def _rpc_result(message_id: Any, result: Any) -> Dict[str, Any]:
+  return {"jsonrpc": "2.0", "id": message_id, "result": result}
+
+def _rpc_error(message_id: Any, code: int, message: str, data: Any = None) -> Dict[str, Any]:
+  error = {"code": code, "message": message}
+  if data is not None:
+    error["data"] = data
+  return {"jsonrpc": "2.0", "id": message_id, "error": error}
+
+async def _process_message(server_wrapper, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+  """Run one decoded MCP message against the user server and build its response."""
+  if type(message) is not dict:
+    # Answer here so the error path below can rely on message.get().
+    return _rpc_error(None, -32600, "Invalid Request: message must be an object")
+  
+  try:
+    method = message.get('method')
+    params = message.get('params', {})
+    
+    if 'id' not in message:
+      return None
+    
+    method_handler = _MCP_METHODS.get(method)
+    if method_handler is None:
+      return _rpc_error(message['id'], -32601, f"Method not found: {method}")
+    
+    return _rpc_result(message['id'], await method_handler(server_wrapper, params))
+  
+  except Exception as e:
+    return _rpc_error(message.get('id'), -32603, str(e), traceback.format_exc())
 
 async def handle_mcp_request(event: Dict[str, Any]) -> Dict[str, Any]:
   """Handle MCP requests by directly calling handlers."""
@@ -156,236 +290,73 @@ async def handle_mcp_request(event: Dict[str, Any]) -> Dict[str, Any]:
     config.reset_request_state()
     
     args_raw = event.get('args', '{}')
-    args = json.loads(args_raw) if isinstance(args_raw, str) else args_raw
+    args = _loads(args_raw) if isinstance(args_raw, (str, bytes)) else args_raw
     
-    server, handlers, server_wrapper = load_user_server(args)
+    _, server_wrapper = _load_user_server(args)
     
     messages_raw = event.get('messages', [])
     
-    responses = []
+    messages = _decode_messages(messages_raw)
     
-    for message_raw in messages_raw:
-      message = json.loads(message_raw) if isinstance(message_raw, str) else message_raw
-      
-      try:
-        method = message.get('method')
-        params = message.get('params', {})
-        
-        if 'id' not in message:
-          continue
-        
-        if method == 'initialize':
-          capabilities = server_wrapper.get_capabilities()
-          
-          responses.append({
-            "jsonrpc": "2.0",
-            "id": message['id'],
-            "result": {
-              "protocolVersion": params.get('protocolVersion', '2024-11-05'),
-              "capabilities": capabilities,
-              "serverInfo": {
-                "name": server_wrapper.name,
-                "version": server_wrapper.version
-              }
-            }
-          })
-        
-        elif method == 'tools/list':
-          if 'list_tools' in handlers:
-            tools = await handlers['list_tools']()
-            responses.append({
-              "jsonrpc": "2.0",
-              "id": message['id'],
-              "result": {"tools": tools if tools else []}
-            })
-          else:
-            responses.append({
-              "jsonrpc": "2.0",
-              "id": message['id'],
-              "result": {"tools": []}
-            })
-        
-        elif method == 'tools/call':
-          if 'call_tool' in handlers:
-            name = params.get('name')
-            arguments = params.get('arguments', {})
-            result = await handlers['call_tool'](name, arguments)
-            responses.append({
-              "jsonrpc": "2.0",
-              "id": message['id'],
-              "result": result
-            })
-          else:
-            raise ValueError("call_tool handler not registered")
-        
-        elif method == 'resources/list':
-          if 'list_resources' in handlers:
-            resources = await handlers['list_resources']()
-            responses.append({
-              "jsonrpc": "2.0",
-              "id": message['id'],
-              "result": {"resources": resources if resources else []}
-            })
-          else:
-            responses.append({
-              "jsonrpc": "2.0",
-              "id": message['id'],
-              "result": {"resources": []}
-            })
-        
-        elif method == 'resources/read':
-          if 'read_resource' in handlers:
-            uri = params.get('uri')
-            result = await handlers['read_resource'](uri)
-            responses.append({
-              "jsonrpc": "2.0",
-              "id": message['id'],
-              "result": result
-            })
-          else:
-            raise ValueError("read_resource handler not registered")
-        
-        elif method == 'prompts/list':
-          if 'list_prompts' in handlers:
-            prompts = await handlers['list_prompts']()
-            responses.append({
-              "jsonrpc": "2.0",
-              "id": message['id'],
-              "result": {"prompts": prompts if prompts else []}
-            })
-          else:
-            responses.append({
-              "jsonrpc": "2.0",
-              "id": message['id'],
-              "result": {"prompts": []}
-            })
-        
-        elif method == 'prompts/get':
-          if 'get_prompt' in handlers:
-            name = params.get('name')
-            arguments = params.get('arguments', {})
-            result = await handlers['get_prompt'](name, arguments)
-            responses.append({
-              "jsonrpc": "2.0",
-              "id": message['id'],
-              "result": result
-            })
-          else:
-            raise ValueError("get_prompt handler not registered")
-        
-        elif method == 'ping':
-          responses.append({
-            "jsonrpc": "2.0",
-            "id": message['id'],
-            "result": {}
-          })
-        
-        else:
-          responses.append({
-            "jsonrpc": "2.0",
-            "id": message['id'],
-            "error": {
-              "code": -32601,
-              "message": f"Method not found: {method}"
-            }
-          })
-      
-      except Exception as e:
-        import traceback
-        responses.append({
-          "jsonrpc": "2.0",
-          "id": message.get('id'),
-          "error": {
-            "code": -32603,
-            "message": str(e),
-            "data": traceback.format_exc()
-          }
-        })
+    responses = await asyncio.gather(*(_process_message(server_wrapper, m) for m in messages))
     
-    await asyncio.sleep(0.1)
-    
-    stringified_responses = [json.dumps(r) for r in responses if r is not None]
+    stringified_responses = [_dumps(r) for r in responses if r is not None]
     
     return {
       "success": True,
       "responses": stringified_responses
     }
   except Exception as e:
-    import traceback
-    return {
-      "success": False,
-      "error": {
-        "code": "mcp_error",
-        "message": str(e) + "\n" + traceback.format_exc()
-      }
-    }
+    return _error_response("mcp_error", e)
+
+_OAUTH_ACTIONS = {
+  'get': lambda _: oauth.handle_oauth_get(),
+  'authorization-url': oauth.handle_oauth_authorization_url,
+  'authorization-form': oauth.handle_oauth_authorization_form,
+  'callback': oauth.handle_oauth_callback,
+  'refresh': oauth.handle_oauth_refresh,
+}
 
 async def handle_oauth_action(event: Dict[str, Any]) -> Dict[str, Any]:
   try:
     config.reset_request_state()
     
-    _, _, _ = load_user_server({})
+    _load_user_server({})
     
     oauth_action = event.get('oauthAction')
     oauth_input = event.get('oauthInput', {})
     
-    if oauth_action == 'get':
-      result = await oauth.handle_oauth_get()
-      return {"success": True, "oauth": result}
-    elif oauth_action == 'authorization-url':
-      result = await oauth.handle_oauth_authorization_url(oauth_input)
-      return {"success": True, "oauth": result}
-    elif oauth_action == 'authorization-form':
-      result = await oauth.handle_oauth_authorization_form(oauth_input)
-      return {"success": True, "oauth": result}
-    elif oauth_action == 'callback':
-      result = await oauth.handle_oauth_callback(oauth_input)
-      return {"success": True, "oauth": result}
-    elif oauth_action == 'refresh':
-      result = await oauth.handle_oauth_refresh(oauth_input)
-      return {"success": True, "oauth": result}
-    else:
+    action_handler = _OAUTH_ACTIONS.get(oauth_action)
+    if action_handler is None:
       raise ValueError(f"Unknown OAuth action: {oauth_action}")
+    
+    result = await action_handler(oauth_input)
+    return {"success": True, "oauth": result}
   except Exception as e:
-    import traceback
-    return {
-      "success": False,
-      "error": {
-        "code": "oauth_error",
-        "message": str(e) + "\n" + traceback.format_exc()
-      }
-    }
+    return _error_response("oauth_error", e)
+
+_CALLBACK_ACTIONS = {
+  'get': lambda _: callbacks.handle_callbacks_get(),
+  'handle': callbacks.handle_callbacks_handle,
+  'install': callbacks.handle_callbacks_install,
+  'poll': callbacks.handle_callbacks_poll,
+}
 
 async def handle_callbacks_action(event: Dict[str, Any]) -> Dict[str, Any]:
   try:
     config.reset_request_state()
     
-    _, _, _ = load_user_server({})
+    _load_user_server({})
     
     callback_action = event.get('callbackAction')
     callback_input = event.get('callbackInput', {})
     
-    if callback_action == 'get':
-      result = await callbacks.handle_callbacks_get()
-      return {"success": True, "callbacks": result}
-    elif callback_action == 'handle':
-      result = await callbacks.handle_callbacks_handle(callback_input)
-      return {"success": True, "callbacks": result}
-    elif callback_action == 'install':
-      result = await callbacks.handle_callbacks_install(callback_input)
-      return {"success": True, "callbacks": result}
-    elif callback_action == 'poll':
-      result = await callbacks.handle_callbacks_poll(callback_input)
-      return {"success": True, "callbacks": result}
-    else:
+    action_handler = _CALLBACK_ACTIONS.get(callback_action)
+    if action_handler is None:
       raise ValueError(f"Unknown callback action: {callback_action}")
+    
+    result = await action_handler(callback_input)
+    return {"success": True, "callbacks": result}
   except Exception as e:
-    import traceback
-    return {
-      "success": False,
-      "error": {
-        "code": "callback_error",
-        "message": str(e) + "\n" + traceback.format_exc()
-      }
-    }
+    return _error_response("callback_error", e)
 
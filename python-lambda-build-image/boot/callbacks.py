@@ -1,21 +1,31 @@
 """Callback handling for Metorial MCP servers."""
 from typing import Any, Dict, Optional, Callable
+import asyncio
 import inspect
 
 from . import config
 
-async def _call_handler(handler: Callable, *args, **kwargs):
-    """Call handler supporting both sync and async functions."""
-    if inspect.iscoroutinefunction(handler):
-        return await handler(*args, **kwargs)
-    else:
+# Upper bound on callback events handled at once in a single batch.
+_HANDLE_CONCURRENCY = 16
+
+def _as_async(handler: Optional[Callable]) -> Optional[Callable]:
+    """Wrap a sync or async handler once so it can always be awaited."""
+    if handler is None or inspect.iscoroutinefunction(handler):
+        return handler
+    
+    async def call(*args, **kwargs):
         result = handler(*args, **kwargs)
         if inspect.iscoroutine(result):
             return await result
         return result
+    
+    return call
 
 class CallbackHandler:
     """Callback handler interface."""
+    
+    __slots__ = ('handle_hook', 'install_hook', 'poll_hook', '_handle', '_install', '_poll')
+    
     def __init__(self,
                  handle_hook: Callable,
                  install_hook: Optional[Callable] = None,
@@ -23,6 +33,9 @@ class CallbackHandler:
         self.handle_hook = handle_hook
         self.install_hook = install_hook
         self.poll_hook = poll_hook
+        self._handle = _as_async(handle_hook)
+        self._install = _as_async(install_hook)
+        self._poll = _as_async(poll_hook)
 
 def set_callbacks(handler: CallbackHandler):
     """Register the callback handler."""
@@ -55,25 +68,29 @@ async def handle_callbacks_handle(input_data: Dict[str, Any]) -> Dict[str, Any]:
     callback_id = input_data.get("callbackId")
     events = input_data.get("events", [])
     
-    results = []
-    for event in events:
-        try:
-            result = await _call_handler(callbacks.handle_hook, {
-                "callbackId": callback_id,
-                "eventId": event.get("eventId"),
-                "payload": event.get("payload")
-            })
-            results.append({
-                "success": True,
-                "eventId": event.get("eventId"),
-                "result": result
-            })
-        except Exception as e:
-            results.append({
-                "success": False,
-                "eventId": event.get("eventId"),
-                "error": str(e)
-            })
+    semaphore = asyncio.Semaphore(_HANDLE_CONCURRENCY)
+    
+    async def handle_event(event):
+        async with semaphore:
+            try:
+                result = await callbacks._handle({
+                    "callbackId": callback_id,
+                    "eventId": event.get("eventId"),
+                    "payload": event.get("payload")
+                })
+                return {
+                    "success": True,
+                    "eventId": event.get("eventId"),
+                    "result": result
+                }
+            except Exception as e:
+                return {
+                    "success": False,
+                    "eventId": event.get("eventId"),
+                    "error": str(e)
+                }
+    
+    results = await asyncio.gather(*(handle_event(event) for event in events))
     
     return {"results": results}
 
@@ -83,7 +100,7 @@ async def handle_callbacks_install(input_data: Dict[str, Any]) -> Dict[str, Any]
     if not callbacks or not callbacks.install_hook:
         raise ValueError("Callback installation not supported")
     
-    await _call_handler(callbacks.install_hook, input_data)
+    await callbacks._install(input_data)
     return {}
 
 async def handle_callbacks_poll(input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -95,12 +112,13 @@ async def handle_callbacks_poll(input_data: Dict[str, Any]) -> Dict[str, Any]:
     callback_id = input_data.get("callbackId")
     state = input_data.get("state")
     
-    state_ref = {"current": state}
+    current_state = state
     
     def set_state(new_state):
-        state_ref["current"] = new_state
+        nonlocal current_state
+        current_state = new_state
     
-    events = await _call_handler(callbacks.poll_hook, {
+    events = await callbacks._poll({
         "callbackId": callback_id,
         "state": state,
         "setState": set_state
@@ -109,4 +127,4 @@ async def handle_callbacks_poll(input_data: Dict[str, Any]) -> Dict[str, Any]:
     if not isinstance(events, list):
         events = [events] if events else []
     
-    return {"events": events, "newState": state_ref["current"]}
+    return {"events": events, "newState": current_state}
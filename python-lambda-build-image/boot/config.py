@@ -1,12 +1,12 @@
 """Configuration management for Metorial MCP servers."""
 from .promise import ProgrammablePromise
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 current_oauth = ProgrammablePromise()
 current_server = ProgrammablePromise()
 current_hook = ProgrammablePromise()
 
-current_args = ProgrammablePromise()
+current_args: Optional[Dict[str, Any]] = None
 
 def set_mcp_auth(value: Any) -> None:
     """Set the OAuth authentication handler."""
@@ -34,12 +34,13 @@ def get_callback_handler() -> Any:
 
 def set_args(args: Dict[str, Any]) -> None:
     """Set the configuration arguments."""
-    current_args.resolve(args)
+    global current_args
+    current_args = args
 
 def get_args() -> Dict[str, Any]:
     """Get the configuration arguments."""
-    return current_args.value if current_args.value is not None else {}
+    return current_args if current_args is not None else {}
 
 def reset_request_state() -> None:
     global current_args
-    current_args = ProgrammablePromise()
+    current_args = None
@@ -13,7 +13,8 @@ from .boot import (
   handle_mcp_request,
   handle_oauth_action,
   handle_callbacks_action,
-  load_user_server
+  load_user_server,
+  prewarm_user_server
 )
 
 from .config import (
@@ -47,6 +48,7 @@ __all__ = [
   'handle_oauth_action',
   'handle_callbacks_action',
   'load_user_server',
+  'prewarm_user_server',
   
   # Configuration
   'set_args',
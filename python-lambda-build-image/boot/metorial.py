@@ -1,12 +1,68 @@
 """Metorial MCP server SDK for Python Lambda."""
-from typing import Any, Callable, Dict, Optional
-from mcp.server import Server
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
 from . import config
 from . import oauth as oauth_module
 from . import callbacks as callbacks_module
 
+if TYPE_CHECKING:
+  from mcp.server import Server
+
 _global_server_wrapper = None
 
+_URI_TEMPLATE_VARIABLE = re.compile(r"\{([+#?/.;&]?)[^}]*\}")
+
+def _uri_template_of(template: Any) -> str:
+  """Get the URI template string of a registered resource template."""
+  if isinstance(template, str):
+    return template
+  return getattr(template, 'uriTemplate', str(template))
+
+def _compile_uri_template(uri_template: str):
+  """Compile a URI template into a regex, or return None if it has no variables."""
+  parts = []
+  last = 0
+  for match in _URI_TEMPLATE_VARIABLE.finditer(uri_template):
+    parts.append(re.escape(uri_template[last:match.start()]))
+    operator = match.group(1)
+    if operator == "":
+      parts.append("[^/]+")
+    elif operator in ("+", "#"):
+      parts.append(".+")
+    else:
+      parts.append(".*")
+    last = match.end()
+  
+  if not parts:
+    return None
+  
+  parts.append(re.escape(uri_template[last:]))
+  return re.compile("".join(parts))
+
+@dataclass(slots=True)
+class ToolEntry:
+  """A registered tool, with its listing fields resolved at registration."""
+  handler: Callable
+  description: str
+  input_schema: Dict[str, Any]
+
+@dataclass(slots=True)
+class ResourceEntry:
+  """A registered resource, with its listing fields resolved at registration."""
+  handler: Callable
+  uri_template: str
+  title: str
+  description: str
+  mime_type: str
+
+@dataclass(slots=True)
+class PromptEntry:
+  """A registered prompt, with its listing fields resolved at registration."""
+  handler: Callable
+  description: str
+  arguments: Optional[Any]
+
 def get_args():
   """Get configuration arguments passed to the server."""
   return config.get_args()
@@ -14,13 +70,58 @@ def get_args():
 class ServerWrapper:
   """Wrapper around MCP Server with registration methods."""
   
-  def __init__(self, mcp_server: Server, name: str, version: str):
-    self.mcp_server = mcp_server
-    self.name = name
-    self.version = version
+  def __init__(self, mcp_server: Optional["Server"], name: str, version: str):
+    self._mcp_server = mcp_server
+    self._name = name
+    self._version = version
+    self._implementation = None
     self._tools = {}
     self._resources = {}
     self._prompts = {}
+    self._capabilities = None
+    self._tools_payload = None
+    self._resources_payload = None
+    self._prompts_payload = None
+    self._resource_routes = None
+  
+  @property
+  def name(self) -> str:
+    return self._name
+  
+  @name.setter
+  def name(self, value: str):
+    self._name = value
+    self._implementation = None
+  
+  @property
+  def version(self) -> str:
+    return self._version
+  
+  @version.setter
+  def version(self, value: str):
+    self._version = value
+    self._implementation = None
+  
+  @property
+  def implementation(self) -> Dict[str, str]:
+    """The {name, version} info reported by discovery, cached until either changes."""
+    if self._implementation is None:
+      self._implementation = {"name": self._name, "version": self._version}
+    return self._implementation
+  
+  @property
+  def mcp_server(self) -> "Server":
+    """The underlying MCP Server, created on first access.
+    
+    Importing the MCP SDK server package is expensive and the boot handlers
+    never need it, so it is kept off the Lambda cold-start path.
+    """
+    if self._mcp_server is None:
+      from mcp.server import Server
+      
+      self._mcp_server = Server(self.name)
+      self._mcp_server.version = self.version
+    return self._mcp_server
     
   def register_tool(
     self, 
@@ -49,10 +150,13 @@ class ServerWrapper:
       server.register_tool('add', {...}, lambda args: {...})
     """
     def decorator(func: Callable):
-      self._tools[name] = {
-        "options": options,
-        "handler": func
-      }
+      self._capabilities = None
+      self._tools_payload = None
+      self._tools[name] = ToolEntry(
+        handler=func,
+        description=options.get("description", ""),
+        input_schema=options.get("inputSchema", {"type": "object", "properties": {}})
+      )
       return func
     
     if handler is None:
@@ -81,11 +185,16 @@ class ServerWrapper:
       If handler is None, returns a decorator. Otherwise returns the handler.
     """
     def decorator(func: Callable):
-      self._resources[name] = {
-        "template": template,
-        "options": options,
-        "handler": func
-      }
+      self._capabilities = None
+      self._resources_payload = None
+      self._resource_routes = None
+      self._resources[name] = ResourceEntry(
+        handler=func,
+        uri_template=_uri_template_of(template),
+        title=options.get("title", name),
+        description=options.get("description", ""),
+        mime_type=options.get("mimeType", "text/plain")
+      )
       return func
     
     if handler is None:
@@ -112,10 +221,13 @@ class ServerWrapper:
       If handler is None, returns a decorator. Otherwise returns the handler.
     """
     def decorator(func: Callable):
-      self._prompts[name] = {
-        "options": options,
-        "handler": func
-      }
+      self._capabilities = None
+      self._prompts_payload = None
+      self._prompts[name] = PromptEntry(
+        handler=func,
+        description=options.get("description", ""),
+        arguments=options.get("arguments")
+      )
       return func
     
     if handler is None:
@@ -161,80 +273,127 @@ class ServerWrapper:
     )
     callbacks_module.set_callbacks(handler)
   
-  async def _list_tools(self):
-    """Internal handler for listing tools."""
+  def _list_tools(self):
+    """Internal handler for listing tools, cached until the next registration."""
+    if self._tools_payload is not None:
+      return self._tools_payload
+    
     tools = []
-    for name, info in self._tools.items():
+    for name, entry in self._tools.items():
       tool_def = {
         "name": name,
-        "description": info["options"].get("description", ""),
-        "inputSchema": info["options"].get("inputSchema", {"type": "object", "properties": {}})
+        "description": entry.description,
+        "inputSchema": entry.input_schema
       }
       tools.append(tool_def)
+    
+    self._tools_payload = tools
     return tools
   
   async def _call_tool(self, name: str, arguments: dict):
     """Internal handler for calling tools."""
-    if name not in self._tools:
-      raise ValueError(f"Unknown tool: {name}")
+    try:
+      entry = self._tools[name]
+    except KeyError:
+      raise ValueError(f"Unknown tool: {name}") from None
     
-    handler = self._tools[name]["handler"]
-    return await handler(arguments)
+    return await entry.handler(arguments)
   
-  async def _list_resources(self):
-    """Internal handler for listing resources."""
+  def _list_resources(self):
+    """Internal handler for listing resources, cached until the next registration."""
+    if self._resources_payload is not None:
+      return self._resources_payload
+    
     resources = []
-    for name, info in self._resources.items():
-      template = info["template"]
-
-      if isinstance(template, str):
-        uri_template = template
-      else:
-        uri_template = getattr(template, 'uriTemplate', str(template))
-      
+    for entry in self._resources.values():
       resource_def = {
-        "uri": uri_template,
-        "name": info["options"].get("title", name),
-        "description": info["options"].get("description", ""),
-        "mimeType": info["options"].get("mimeType", "text/plain")
+        "uri": entry.uri_template,
+        "name": entry.title,
+        "description": entry.description,
+        "mimeType": entry.mime_type
       }
       resources.append(resource_def)
+    
+    self._resources_payload = resources
     return resources
   
+  def _get_resource_routes(self):
+    """Build exact and templated resource routes, cached until the next registration."""
+    if self._resource_routes is None:
+      exact = {}
+      templated = []
+      for name, entry in self._resources.items():
+        pattern = _compile_uri_template(entry.uri_template)
+        if pattern is None:
+          exact.setdefault(entry.uri_template, []).append(name)
+        else:
+          templated.append((pattern, name))
+      self._resource_routes = (exact, templated)
+    return self._resource_routes
+  
   async def _read_resource(self, uri: str):
-    """Internal handler for reading resources."""
-    for name, info in self._resources.items():
-      handler = info["handler"]
-
-      result = await handler(uri)
+    """Internal handler for reading resources.
+    
+    Resources whose template matches the URI are tried first. The remaining
+    handlers are only consulted if none of those return a result.
+    """
+    exact, templated = self._get_resource_routes()
+    
+    matched = list(exact.get(uri, ()))
+    for pattern, name in templated:
+      if pattern.fullmatch(uri):
+        matched.append(name)
+    
+    for name in matched:
+      result = await self._resources[name].handler(uri)
+      if result:
+        return result
+    
+    for name, entry in self._resources.items():
+      if name in matched:
+        continue
+      
+      result = await entry.handler(uri)
       if result:
         return result
     
     raise ValueError(f"Unknown resource: {uri}")
   
-  async def _list_prompts(self):
-    """Internal handler for listing prompts."""
+  def _list_prompts(self):
+    """Internal handler for listing prompts, cached until the next registration."""
+    if self._prompts_payload is not None:
+      return self._prompts_payload
+    
     prompts = []
-    for name, info in self._prompts.items():
+    for name, entry in self._prompts.items():
       prompt_def = {
         "name": name,
-        "description": info["options"].get("description", ""),
+        "description": entry.description,
       }
-      if "arguments" in info["options"]:
-        prompt_def["arguments"] = info["options"]["arguments"]
+      if entry.arguments is not None:
+        prompt_def["arguments"] = entry.arguments
       prompts.append(prompt_def)
+    
+    self._prompts_payload = prompts
     return prompts
   
   async def _get_prompt(self, name: str, arguments: dict):
     """Internal handler for getting prompts."""
-    if name not in self._prompts:
-      raise ValueError(f"Unknown prompt: {name}")
+    try:
+      entry = self._prompts[name]
+    except KeyError:
+      raise ValueError(f"Unknown prompt: {name}") from None
     
-    handler = self._prompts[name]["handler"]
-    return await handler(arguments)
+    return await entry.handler(arguments)
   
   def get_capabilities(self):
-    """Get server capabilities based on registered tools/resources/prompts."""
+    """Get server capabilities based on registered tools/resources/prompts.
+    
+    The result is cached until the next registration.
+    """
+    if self._capabilities is not None:
+      return self._capabilities
+    
     capabilities = {
       "experimental": {}
     }
@@ -255,6 +414,7 @@ class ServerWrapper:
         "listChanged": False
       }
     
+    self._capabilities = capabilities
     return capabilities
 
 def create_server(info: Dict[str, str]):
@@ -282,9 +442,7 @@ def create_server(info: Dict[str, str]):
   name = info.get("name", "mcp-server")
   version = info.get("version", "1.0.0")
   
-  mcp_server = Server(name)
-  mcp_server.version = version
-  server_wrapper = ServerWrapper(mcp_server, name, version)
+  server_wrapper = ServerWrapper(None, name, version)
   _global_server_wrapper = server_wrapper
 
   config.set_server(server_wrapper)
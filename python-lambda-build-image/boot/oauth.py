@@ -1,19 +1,8 @@
 """OAuth handling for Metorial MCP servers."""
 from typing import Any, Dict, Optional, Callable
-import inspect
 
 from . import config
-
-async def _call_handler(handler: Callable, *args, **kwargs):
-    """Call handler supporting both sync and async functions."""
-    if inspect.iscoroutinefunction(handler):
-        return await handler(*args, **kwargs)
-    else:
-        result = handler(*args, **kwargs)
-        # If result is a coroutine, await it
-        if inspect.iscoroutine(result):
-            return await result
-        return result
+from .callbacks import _as_async
 
 class OAuthHandler:
     """OAuth handler interface."""
@@ -27,6 +16,10 @@ class OAuthHandler:
         self.handle_callback = handle_callback
         self.get_auth_form = get_auth_form
         self.refresh_access_token = refresh_access_token
+        self._get_authorization_url = _as_async(get_authorization_url)
+        self._handle_callback = _as_async(handle_callback)
+        self._get_auth_form = _as_async(get_auth_form)
+        self._refresh_access_token = _as_async(refresh_access_token)
 
 def set_oauth(handler: OAuthHandler):
     """Register the OAuth handler."""
@@ -49,7 +42,7 @@ async def handle_oauth_authorization_url(input_data: Dict[str, Any]) -> Dict[str
     if not oauth:
         raise ValueError("OAuth not configured")
     
-    result = await _call_handler(oauth.get_authorization_url, input_data)
+    result = await oauth._get_authorization_url(input_data)
     if isinstance(result, str):
         return {"authorizationUrl": result, "codeVerifier": ""}
     return result
@@ -60,7 +53,7 @@ async def handle_oauth_authorization_form(input_data: Dict[str, Any]) -> Dict[st
     if not oauth or not oauth.get_auth_form:
         raise ValueError("OAuth form not available")
     
-    form = await _call_handler(oauth.get_auth_form, input_data)
+    form = await oauth._get_auth_form(input_data)
     return {"authForm": form}
 
 async def handle_oauth_callback(input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -69,7 +62,7 @@ async def handle_oauth_callback(input_data: Dict[str, Any]) -> Dict[str, Any]:
     if not oauth:
         raise ValueError("OAuth not configured")
     
-    auth_data = await _call_handler(oauth.handle_callback, input_data)
+    auth_data = await oauth._handle_callback(input_data)
     return {"authData": auth_data}
 
 async def handle_oauth_refresh(input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -78,5 +71,5 @@ async def handle_oauth_refresh(input_data: Dict[str, Any]) -> Dict[str, Any]:
     if not oauth or not oauth.refresh_access_token:
         raise ValueError("OAuth refresh not supported")
     
-    auth_data = await _call_handler(oauth.refresh_access_token, input_data)
+    auth_data = await oauth._refresh_access_token(input_data)
     return {"authData": auth_data}
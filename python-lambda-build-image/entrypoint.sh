@@ -69,9 +69,9 @@ else
   echo "No requirements.txt found. Will create minimal one."
 fi
 
-# Always install mcp dependency
-echo "Installing MCP SDK..."
-pip install --no-cache-dir "mcp>=1.0.0" -t .
+# Always install mcp and orjson dependencies
+echo "Installing MCP SDK and orjson..."
+pip install --no-cache-dir "mcp>=1.0.0" "orjson>=3.9.0" -t .
 
 # Copy boot scripts to root level
 echo "Copying Metorial boot scripts..."
@@ -87,6 +87,13 @@ find /workspace/src -type d -name "*.egg-info" -exec rm -rf {} + 2>/dev/null ||
 find /workspace/src -type f -name "*.pyc" -delete 2>/dev/null || true
 find /workspace/src -type f -name "*.pyo" -delete 2>/dev/null || true
 
+# Precompile bytecode so cold starts don't recompile sources on the
+# read-only Lambda filesystem. Hash-based pycs stay valid after the zip
+# round trip rewrites source mtimes.
+echo "Precompiling Python bytecode..."
+python -m compileall -q --invalidation-mode unchecked-hash /workspace/src \
+  || echo "Some files could not be precompiled; they will be compiled at runtime."
+
 # Zip the Lambda package
 echo "Creating deployment package..."
 cd /workspace/src
@@ -1,38 +1,42 @@
 import json
+import os
 import asyncio
+import traceback
 from typing import Any, Dict
 
 from boot import boot
 
+# One event loop for the lifetime of the Lambda container, reused by every warm invocation.
+_loop = asyncio.new_event_loop()
+asyncio.set_event_loop(_loop)
+
+if os.environ.get('METORIAL_PREWARM') == '1':
+  boot.prewarm_user_server()
+
+_ACTIONS = {
+  'discover': boot.handle_discover,
+  'mcp.request': boot.handle_mcp_request,
+  'mcp.batch': boot.handle_mcp_request,
+  'oauth': boot.handle_oauth_action,
+  'callbacks': boot.handle_callbacks_action,
+}
+
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
   action = event.get('action')
   
   try:
-    loop = asyncio.get_event_loop()
-    if loop.is_running():
-      loop = asyncio.new_event_loop()
-      asyncio.set_event_loop(loop)
-    
-    if action == 'discover':
-      result = loop.run_until_complete(boot.handle_discover(event))
-    elif action == 'mcp.request' or action == 'mcp.batch':
-      result = loop.run_until_complete(boot.handle_mcp_request(event))
-    elif action == 'oauth':
-      result = loop.run_until_complete(boot.handle_oauth_action(event))
-    elif action == 'callbacks':
-      result = loop.run_until_complete(boot.handle_callbacks_action(event))
-    else:
-      result = {
+    action_handler = _ACTIONS.get(action)
+    if action_handler is None:
+      return {
         "success": False,
         "error": {
           "code": "unknown_action",
           "message": f"Unknown action: {action}"
         }
       }
-      
-    return result
+    
+    return _loop.run_until_complete(action_handler(event))
   except Exception as e:
-    import traceback
     return {
       "success": False,
       "error": {